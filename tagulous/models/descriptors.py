@@ -208,8 +208,8 @@ class TagDescriptor(BaseTagDescriptor):
 
         # Set value
         if not value:
-            # Clear
-            manager.set_tag_string("")
+            # Clear - no need to parse an empty tag string
+            manager.set_tag_list([])
 
         elif isinstance(value, six.string_types):
             # If it's a string, it must be a tag string
@@ -286,7 +286,7 @@ class BaseTagField(object):
         if isinstance(self.tag_options, TagOptions):
             # When deconstruct is called on a real field on a real model,
             # we will have a concrete tag model, so use its tag options
-            items = self.tag_options.items(with_defaults=False)
+            items = self.tag_options._get_set_items()
 
             # Freeze initial as a string, not array
             if "initial" in items:
@@ -8,13 +8,38 @@ For tag model manager, look in tagulous.models.models
 """
 from __future__ import unicode_literals
 
+import operator
+
 from django.core import exceptions
+from django.db import models
 import six
 from django.utils.encoding import python_2_unicode_compatible
 
 from tagulous.utils import parse_tags, render_tags
 
 
+# Get the name of a tag
+_name_getter = operator.attrgetter("name")
+
+# Maximum number of tag names to look up in a single query
+_LOOKUP_BATCH_SIZE = 500
+
+
+def _name_lookup(tag_model, tag_options, tag_name):
+    """
+    Return the lookup kwargs to find a tag by name
+
+    Case insensitive lookups use the tag model's ``name_lower`` field if it
+    has one, so that they can use an index; otherwise they fall back to
+    ``name__iexact``.
+    """
+    if tag_options.case_sensitive:
+        return {"name": tag_name}
+    if tag_model._has_name_lower:
+        return {"name_lower": tag_name.lower()}
+    return {"name__iexact": tag_name}
+
+
 # ##############################################################################
 # ###### Manager for SingleTagField
 # ##############################################################################
@@ -62,14 +87,19 @@ class SingleTagManager(object):
         Must be called after all
         """
         # Django 2.0 changes cache management
+        # Try to delete directly rather than checking first, to avoid a
+        # second lookup when it is cached
         if hasattr(self.field, "get_cached_value"):
-            if self.field.is_cached(self.instance):
+            try:
                 self.field.delete_cached_value(self.instance)
+            except KeyError:
+                pass
         else:
             # Django <2.0
-            cache_name = self.field.get_cache_name()
-            if hasattr(self.instance, cache_name):
-                delattr(self.instance, cache_name)
+            try:
+                delattr(self.instance, self.field.get_cache_name())
+            except AttributeError:
+                pass
 
     def get_actual(self):
         """
@@ -131,17 +161,23 @@ class SingleTagManager(object):
             if not self.tag_name:
                 return None
 
+            # If the tag was found in the database before, reuse it until the
+            # tag name changes or the instance is saved
+            if self.tag_cache is not None and self.tag_cache.pk:
+                return self.tag_cache
+
             # Try to look up the tag
             try:
-                if self.tag_options.case_sensitive:
-                    tag = self.tag_model.objects.get(name=self.tag_name)
-                else:
-                    tag = self.tag_model.objects.get(name__iexact=self.tag_name)
+                tag = self.tag_model.objects.get(
+                    **_name_lookup(self.tag_model, self.tag_options, self.tag_name)
+                )
             except self.tag_model.DoesNotExist:
                 # Does not exist yet, create a temporary one (but don't save)
                 if not self.tag_cache:
                     self.tag_cache = self.tag_model(name=self.tag_name, protected=False)
                 tag = self.tag_cache
+            else:
+                self.tag_cache = tag
             return tag
         else:
             # Return the response that it should have had (a Tag or None)
@@ -177,6 +213,10 @@ class SingleTagManager(object):
         """
         When the model is about to save, update the tag value
         """
+        # Don't trust a tag found earlier - it may have been deleted since
+        if self.changed and self.tag_cache is not None and self.tag_cache.pk:
+            self.tag_cache = None
+
         # Get the new tag
         new_tag = self.get()
 
@@ -252,6 +292,10 @@ class BaseTagRelatedManager(object):
     Mixin for TagRelatedManagerMixin, and base class for FakeTagRelatedManager.
 
     Provides methods to managed cached tags
+
+    Tags can be set from a tag string with set_tag_string, or from a list of
+    tag names or tags with set_tag_list. If the tags are already in a list,
+    use set_tag_list directly to avoid rendering and parsing a tag string.
     """
 
     @property
@@ -280,6 +324,10 @@ class BaseTagRelatedManager(object):
         self.changed = False
         self.tags = None
 
+        # Cache of the rendered tag string: (tag names, tag string)
+        # Only used while the names it was rendered from are unchanged
+        self._rendered_cache = (None, None)
+
     def __str__(self):
         """
         If called on an instance, return the tag string
@@ -299,10 +347,11 @@ class BaseTagRelatedManager(object):
         """
         Compare a tag string or iterable of tags to the tags on this manager
         """
+        case_sensitive = self.tag_options.case_sensitive
+        force_lower = self.tag_options.force_lowercase
+
         # If not case sensitive, or lowercase forced, compare on lowercase
-        lower = False
-        if self.tag_options.force_lowercase or not self.tag_options.case_sensitive:
-            lower = True
+        lower = force_lower or not case_sensitive
 
         # Prep other argument we're comparing against
         if isinstance(other, BaseTagRelatedManager):
@@ -310,6 +359,10 @@ class BaseTagRelatedManager(object):
         if isinstance(other, six.string_types):
             other_str = six.text_type(other)
 
+            # An empty string can only match no tags - no need to parse
+            if not other_str.strip():
+                return not self.tags
+
             # Enforce case non-sensitivity or lowercase
             if lower:
                 other_str = other_str.lower()
@@ -320,31 +373,30 @@ class BaseTagRelatedManager(object):
             )
 
         else:
-            # Assume it's an iterable
-            other_tags = other
+            # Assume it's an iterable of tags or tag names - already parsed
+            # Compare on names; tags would be hashed by pk, not name
+            other_tags = [six.text_type(tag) for tag in other]
             if lower:
-                other_tags = [six.text_type(tag).lower() for tag in other]
+                other_tags = [tag.lower() for tag in other_tags]
+
+        # Hash other tags for constant-time lookups
+        other_set = frozenset(other_tags)
 
         # Get list of set tags
         self_tags = self.get_tag_list()
 
-        # Compare tag count
-        if len(other_tags) != len(self_tags):
+        # Compare tag count - duplicates in other will have collapsed
+        if len(other_set) != len(self_tags):
             return False
 
-        # Compare tags
-        for tag in self_tags:
-            # If lowercase or not case sensitive, lower for comparison
-            if lower:
-                tag = tag.lower()
-
-            # Check tag in other tags
-            if tag not in other_tags:
-                return False
+        # If lowercase or not case sensitive, lower for comparison
+        self_iter = self_tags
+        if lower:
+            self_iter = (tag.lower() for tag in self_tags)
 
         # Same number of tags, and all self tags present in other tags
         # It's a match
-        return True
+        return all(tag in other_set for tag in self_iter)
 
     def __ne__(self, other):
         """
@@ -367,13 +419,20 @@ class BaseTagRelatedManager(object):
         """
         Get the tag edit string for this instance as a string
         """
-        return render_tags(self.tags)
+        names = tuple(map(six.text_type, self.tags))
+        cached_names, rendered = self._rendered_cache
+        if cached_names == names:
+            return rendered
+
+        rendered = render_tags(names)
+        self._rendered_cache = (names, rendered)
+        return rendered
 
     def get_tag_list(self):
         """
         Get the tag names for this instance as a list of tag names
         """
-        return [tag.name for tag in self.tags]
+        return list(map(_name_getter, self.tags))
 
     def set_tag_string(self, tag_string):
         """
@@ -394,30 +453,34 @@ class BaseTagRelatedManager(object):
         Sets the tags for this instance, given a list of tag names, or a list
         or queryset of tags
         """
-        if self.tag_options.max_count and len(tag_names) > self.tag_options.max_count:
-            raise ValueError(
-                "Cannot set more than %d tags on this field"
-                % self.tag_options.max_count
-            )
+        # Read options once, they are used repeatedly below
+        case_sensitive = self.tag_options.case_sensitive
+        force_lower = self.tag_options.force_lowercase
+        max_count = self.tag_options.max_count
+
+        if max_count and len(tag_names) > max_count:
+            raise ValueError("Cannot set more than %d tags on this field" % max_count)
 
         # Force tag_names to strings, in case it's a list of tags or a queryset
-        tag_names = [six.text_type(tag_name) for tag_name in tag_names]
+        # Most will already be strings, so only convert those which aren't
+        text_type = six.text_type
+        tag_names = [
+            tag_name if type(tag_name) is text_type else text_type(tag_name)
+            for tag_name in tag_names
+        ]
 
         # Apply force_lowercase
-        if self.tag_options.force_lowercase:
+        if force_lower:
             # Will be lowercase for later comparison
-            tag_names = [name.lower() for name in tag_names]
+            tag_names = list(map(text_type.lower, tag_names))
 
         # Prep tag lookup
+        # If not case sensitive, need to compare on lowercase
         # old_tags      = { cmp_name: tag }
         # cmp_new_names = { cmp_name: cased_name }
-        if self.tag_options.case_sensitive:
-            old_tags = dict([(tag.name, tag) for tag in self.tags])
-            cmp_new_names = dict([(n, n) for n in tag_names])
-        else:
-            # Not case sensitive - need to compare on lowercase
-            old_tags = dict([(tag.name.lower(), tag) for tag in self.tags])
-            cmp_new_names = dict([(name.lower(), name) for name in tag_names])
+        cmp_key = (lambda name: name) if case_sensitive else text_type.lower
+        old_tags = {cmp_key(tag.name): tag for tag in self.tags}
+        cmp_new_names = {cmp_key(name): name for name in tag_names}
 
         # See which tags are staying
         new_tags = []
@@ -431,14 +494,11 @@ class BaseTagRelatedManager(object):
                 self.changed = True
 
         # Only left with tag names which aren't present
-        for tag_name in cmp_new_names.values():
-            # Find or create all new tags
-            try:
-                if self.tag_options.case_sensitive:
-                    tag = self.tag_model.objects.get(name=tag_name)
-                else:
-                    tag = self.tag_model.objects.get(name__iexact=tag_name)
-            except self.tag_model.DoesNotExist:
+        # Find all that already exist in bulk, rather than one query per tag
+        db_tags = self._get_tags_by_name(cmp_new_names.values())
+        for cmp_new_name, tag_name in cmp_new_names.items():
+            tag = db_tags.get(cmp_new_name)
+            if tag is None:
                 # Don't create it until it's saved
                 tag = self.tag_model(name=tag_name, protected=False)
 
@@ -451,6 +511,49 @@ class BaseTagRelatedManager(object):
 
     set_tag_list.alters_data = True
 
+    def _get_tags_by_name(self, tag_names):
+        """
+        Find existing tags by name, using one query per batch of names
+
+        Returns a dict of ``{ cmp_name: tag }``, where ``cmp_name`` is the tag
+        name, or the lowercase tag name if the field is not case sensitive.
+
+        Case insensitive matches are found by the database and then keyed by
+        Python's ``str.lower()``, so a database which only folds ASCII case
+        (eg SQLite) will still find a non-ASCII name given in its stored case.
+        """
+        tag_names = list(tag_names)
+        found = {}
+        for i in range(0, len(tag_names), _LOOKUP_BATCH_SIZE):
+            found.update(
+                self._get_tags_by_name_batch(tag_names[i : i + _LOOKUP_BATCH_SIZE])
+            )
+        return found
+
+    def _get_tags_by_name_batch(self, tag_names):
+        """
+        Find existing tags for a batch of names with a single query
+
+        Batches are kept small enough to stay within the database's limits on
+        query parameters and expression depth.
+        """
+        if self.tag_options.case_sensitive:
+            tags = self.tag_model.objects.filter(name__in=tag_names)
+            return {tag.name: tag for tag in tags}
+
+        # Not case sensitive - need to compare on lowercase
+        if self.tag_model._has_name_lower:
+            tags = self.tag_model.objects.filter(
+                name_lower__in=[name.lower() for name in tag_names]
+            )
+        else:
+            # Let the database decide what matches, as name__iexact would
+            query = models.Q()
+            for name in tag_names:
+                query = query | models.Q(name__iexact=name)
+            tags = self.tag_model.objects.filter(query)
+        return {tag.name.lower(): tag for tag in tags}
+
 
 class FakeTagRelatedManager(BaseTagRelatedManager):
     """
@@ -548,17 +651,22 @@ class TagRelatedManagerMixin(BaseTagRelatedManager):
 
         # Add and remove tags as necessary
         new_tags = self._ensure_tags_in_db(self.tags)
-        self.reload()
-
-        # Add new tags
-        for new_tag in new_tags:
-            if new_tag not in self.tags:
-                self.add(new_tag, _enforce_max_count=False)
 
-        # Remove old tags
-        for old_tag in self.tags:
-            if old_tag not in new_tags:
-                self.remove(old_tag)
+        # Find the difference from the actual tags
+        # Tags in the db all have a pk, so can be compared using sets
+        current_tags = list(self.all())
+        current_set = set(current_tags)
+        new_set = set(new_tags)
+        add_tags = [tag for tag in new_tags if tag not in current_set]
+        rm_tags = [tag for tag in current_tags if tag not in new_set]
+
+        # Add new tags and remove old tags, in one call each
+        # The current tags have just been loaded, so they don't need a reload
+        self.tags = current_tags
+        if add_tags:
+            self.add(*add_tags, _enforce_max_count=False, _reload=False)
+        if rm_tags:
+            self.remove(*rm_tags, _reload=False)
         self.tags = new_tags
         self.changed = False
 
@@ -568,20 +676,31 @@ class TagRelatedManagerMixin(BaseTagRelatedManager):
         """
         Ensure that self.tags all exist in the database
         """
+        case_sensitive = self.tag_options.case_sensitive
+
+        # Find any unsaved tags which are already in the DB in bulk
+        found = self._get_tags_by_name(tag.name for tag in tags if not tag.pk)
+
         db_tags = []
         for tag in tags:
             if tag.pk:
                 # Already in DB
                 db_tag = tag
             else:
-                # Not in DB - get or create
-                field_lookup = "name"
-                if not self.tag_options.case_sensitive:
-                    field_lookup += "__iexact"
-                db_tag, __ = self.tag_model.objects.get_or_create(
-                    defaults={"name": tag.name, "protected": False},
-                    **{field_lookup: tag.name}
-                )
+                cmp_name = tag.name
+                if not case_sensitive:
+                    cmp_name = cmp_name.lower()
+
+                db_tag = found.get(cmp_name)
+                if db_tag is None:
+                    # Not in DB - create it. Not using bulk_create because
+                    # the tag model's save() needs to set the slug and tree
+                    # fields, and get_or_create guards against races.
+                    db_tag, __ = self.tag_model.objects.get_or_create(
+                        defaults={"name": tag.name, "protected": False},
+                        **_name_lookup(self.tag_model, self.tag_options, tag.name)
+                    )
+                    found[cmp_name] = db_tag
             db_tags.append(db_tag)
         return db_tags
 
@@ -596,25 +715,34 @@ class TagRelatedManagerMixin(BaseTagRelatedManager):
         """
         Add a list of tags or tag strings
 
-        Takes on internal argument, _enforce_max_count - don't use in your code
+        Takes internal arguments, _enforce_max_count and _reload - don't use
+        them in your code
         """
         enforce_max_count = kwargs.pop("_enforce_max_count", True)
+        reload_tags = kwargs.pop("_reload", True)
         if kwargs:
             raise TypeError("add() got an unexpected keyword argument")
 
-        # Convert strings to tag objects
+        # Convert strings to tag objects, finding existing ones in bulk
+        case_sensitive = self.tag_options.case_sensitive
+        db_tags = self._get_tags_by_name(
+            [tag for tag in objs if isinstance(tag, six.string_types)]
+        )
         new_tags = []
         for tag in objs:
             if isinstance(tag, six.string_types):
-                new_tags.append(self.tag_model(name=tag))
-            else:
-                new_tags.append(tag)
+                cmp_name = tag if case_sensitive else tag.lower()
+                tag = db_tags.get(cmp_name) or self.tag_model(name=tag)
+            new_tags.append(tag)
 
         # Don't trust the internal tag cache
-        self.reload()
+        if reload_tags:
+            self.reload()
 
         # Reduce tags to ones not already loaded
-        new_tags = [tag for tag in new_tags if tag not in self.tags]
+        # Unsaved tags can't be hashed, but also can't be loaded
+        current_set = set(self.tags)
+        new_tags = [tag for tag in new_tags if tag.pk is None or tag not in current_set]
 
         # Enforce max_count
         if enforce_max_count and self.tag_options.max_count:
@@ -636,26 +764,38 @@ class TagRelatedManagerMixin(BaseTagRelatedManager):
 
     add.alters_data = True
 
-    def remove(self, *objs):
+    def remove(self, *objs, **kwargs):
+        """
+        Remove a list of tags or tag strings
+
+        Takes an internal argument, _reload - don't use in your code
+        """
+        reload_tags = kwargs.pop("_reload", True)
+        if kwargs:
+            raise TypeError("remove() got an unexpected keyword argument")
+
         # Convert strings to tag objects - if object doesn't exist, skip
         rm_tags = []
+        rm_names = []
         for tag in objs:
             if isinstance(tag, six.string_types):
-                try:
-                    rm_tags.append(self.tag_model.objects.get(name=tag))
-                except self.tag_model.DoesNotExist:
-                    continue
+                rm_names.append(tag)
             else:
                 rm_tags.append(tag)
+        if rm_names:
+            rm_tags.extend(self.tag_model.objects.filter(name__in=rm_names))
 
         # Don't trust the internal tag cache
-        self.reload()
+        if reload_tags:
+            self.reload()
 
         # Cut tags back to only ones already set
-        rm_tags = [tag for tag in self.tags if tag in rm_tags]
+        # Unsaved tags can't be hashed, but also can't be set
+        rm_set = set([tag for tag in rm_tags if tag.pk is not None])
+        rm_tags = [tag for tag in self.tags if tag in rm_set]
 
         # Remove from cache
-        self.tags = [tag for tag in self.tags if tag not in rm_tags]
+        self.tags = [tag for tag in self.tags if tag not in rm_set]
 
         # Remove from db and decrement
         super(TagRelatedManagerMixin, self).remove(*self._ensure_tags_in_db(rm_tags))
@@ -4,6 +4,7 @@ Tagulous tag models
 from __future__ import unicode_literals
 
 import django
+from django.core.exceptions import FieldDoesNotExist
 from django.db import IntegrityError, connection, models, router, transaction
 from django.db.models import F, Max
 import six
@@ -179,12 +180,11 @@ class TagModelBase(models.base.ModelBase):
         # TagMeta takes priority for the model
         new_tag_options = None
         if "TagMeta" in attrs:
-            tag_meta = {}
-            tag_meta = dict(
-                (key, val)
+            tag_meta = {
+                key: val
                 for key, val in attrs["TagMeta"].__dict__.items()
                 if key in constants.OPTION_DEFAULTS
-            )
+            }
             if "tree" in tag_meta:
                 raise ValueError("Cannot set tree option in TagMeta")
 
@@ -220,6 +220,15 @@ class TagModelBase(models.base.ModelBase):
                 # Change it to use this one
                 field.tag_options = new_tag_options
 
+        # Note whether the optional name_lower field is present, so lookups
+        # don't need to check for it every time
+        try:
+            new_cls._meta.get_field("name_lower")
+        except FieldDoesNotExist:
+            new_cls._has_name_lower = False
+        else:
+            new_cls._has_name_lower = True
+
         return new_cls
 
 
@@ -499,6 +508,10 @@ class BaseTagModel(with_metaclass(TagModelBase, models.Model)):
         # real world, but until Django provides a reliable way to determine
         # the cause of an IntegrityError, we can never make this perfect.
 
+        # Keep the optional lowercase name in sync for case insensitive lookups
+        if self._has_name_lower:
+            self.name_lower = self.name.lower()
+
         # If already in the database and has a slug set, just save as normal
         # Set slug to None to rebuild it
         if self.pk and self.slug:
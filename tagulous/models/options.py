@@ -12,8 +12,14 @@ from tagulous.utils import parse_tags, render_tags
 class TagOptions(object):
     """
     Simple class container for tag options
+
+    Options which have been set are stored in the instance __dict__; any which
+    have not been set fall back to the defaults, which are class attributes.
     """
 
+    # Bound once to avoid looking up the constants module on each access
+    _OPTION_DEFAULTS = constants.OPTION_DEFAULTS
+
     def __init__(self, **kwargs):
         """
         Set up tag options using defaults, overridden by keyword arguments
@@ -26,7 +32,7 @@ class TagOptions(object):
         """
         # Ensure a dict
         if isinstance(options, TagOptions):
-            options = options.items(with_defaults=False)
+            options = options._get_set_items()
 
         for key, val in options.items():
             setattr(self, key, val)
@@ -42,10 +48,10 @@ class TagOptions(object):
         """
         # Ensure a dict
         if isinstance(options, TagOptions):
-            options = options.items(with_defaults=False)
+            options = options._get_set_items()
 
         # Get currently set keys
-        items = self.items(with_defaults=False)
+        items = self._get_set_items()
         for key, val in options.items():
             if key not in items:
                 setattr(self, key, val)
@@ -62,54 +68,79 @@ class TagOptions(object):
         """
         Only allow an option to be set if it's valid
         """
+        # Options are changing, clear cached items
+        self.__dict__.pop("_items_cache", None)
+
         if name == "initial":
-            # Store as a list of strings, with the tag string available on
-            # initial_string for migrations
+            # Will be available as a list of strings, with the tag string
+            # available on initial_string for migrations. Store what we have
+            # now, and convert to the other when it is first read.
+            self.__dict__.pop("initial_string", None)
             if value is None:
                 self.__dict__["initial_string"] = ""
                 self.__dict__["initial"] = []
             elif isinstance(value, six.string_types):
                 self.__dict__["initial_string"] = value
-                self.__dict__["initial"] = parse_tags(value)
-            else:
-                self.__dict__["initial_string"] = render_tags(value)
                 self.__dict__["initial"] = value
+            else:
+                # Already parsed, ensure it's a list
+                self.__dict__["initial"] = list(value)
 
-        elif name in constants.OPTION_DEFAULTS:
+        elif name in self._OPTION_DEFAULTS:
             self.__dict__[name] = value
         else:
             raise AttributeError(name)
 
-    def __getattr__(self, name):
+    @property
+    def initial(self):
         """
-        Fall back to default options if it's not set
+        The initial tags as a list of strings
 
-        Requests for locally-defined properties will be fielded directly by
-        __dict__
+        Tag strings are parsed on first access
         """
-        if name == "initial_string":
-            # If here, there is no initial set in the __dict__
-            # There is nothing in defaults to fall back to either
-            return ""
-        if name not in constants.OPTION_DEFAULTS:
-            raise AttributeError(name)
-        return self.__dict__.get(name, constants.OPTION_DEFAULTS[name])
+        if "initial" not in self.__dict__:
+            return self._OPTION_DEFAULTS["initial"]
+        value = self.__dict__["initial"]
+        if isinstance(value, six.string_types):
+            value = self.__dict__["initial"] = parse_tags(value)
+        return value
+
+    @property
+    def initial_string(self):
+        """
+        The initial tags as a tag string, for migrations
+
+        Lists of tags are rendered on first access
+        """
+        if "initial_string" not in self.__dict__:
+            if "initial" not in self.__dict__:
+                # There is no initial set, and nothing in defaults
+                return ""
+            self.__dict__["initial_string"] = render_tags(self.__dict__["initial"])
+        return self.__dict__["initial_string"]
 
     def _get_items(self, with_defaults, keys):
         """
         Return a dict of options specified in keys, with defaults if required
         """
         if with_defaults:
-            return dict(
-                [
-                    (name, self.__dict__.get(name, constants.OPTION_DEFAULTS[name]))
-                    for name in keys
-                ]
-            )
+            return {name: getattr(self, name) for name in keys}
+
+        return {name: getattr(self, name) for name in self.__dict__ if name in keys}
+
+    def _get_set_items(self):
+        """
+        Return a dict of the options which have been set, as they were stored
 
-        return dict(
-            [(name, value) for name, value in self.__dict__.items() if name in keys]
-        )
+        Unlike items(with_defaults=False), initial is not parsed if it was
+        set as a tag string, so it is suitable for passing to another
+        TagOptions
+        """
+        return {
+            name: value
+            for name, value in self.__dict__.items()
+            if name in self._OPTION_DEFAULTS
+        }
 
     def items(self, with_defaults=True):
         """
@@ -117,8 +148,14 @@ class TagOptions(object):
 
         If with_defaults is True, any missing options will be set to their
         defaults; if False, missing options will be omitted.
+
+        The result is cached until an option is next set; a copy is returned,
+        so it is safe to change.
         """
-        return self._get_items(with_defaults, constants.OPTION_DEFAULTS)
+        cache = self.__dict__.setdefault("_items_cache", {})
+        if with_defaults not in cache:
+            cache[with_defaults] = self._get_items(with_defaults, self._OPTION_DEFAULTS)
+        return dict(cache[with_defaults])
 
     def form_items(self, with_defaults=True):
         """
@@ -135,6 +172,15 @@ class TagOptions(object):
         Return a new TagOptions object with the options set on this object,
         overridden by any on the second specified TagOptions object.
         """
-        dct = self.items(with_defaults=False)
-        dct.update(options.items(with_defaults=False))
+        dct = self._get_set_items()
+        dct.update(options._get_set_items())
         return TagOptions(**dct)
+
+
+# Make the defaults available as class attributes, so reading an option which
+# has not been set is a normal attribute lookup. Options with properties handle
+# their own defaults.
+for _name, _value in TagOptions._OPTION_DEFAULTS.items():
+    if _name not in TagOptions.__dict__:
+        setattr(TagOptions, _name, _value)
+del _name, _value
@@ -55,6 +55,30 @@ class TagSlugShorterModel(tagulous.models.BaseTagModel):
         unique_together = (("slug",),)
 
 
+class TagNameLowerModel(tagulous.models.TagModel):
+    """
+    A tag model with the optional name_lower field
+    """
+
+    name_lower = models.CharField(
+        max_length=191, db_index=True, blank=True, editable=False
+    )
+
+
+class TagNameLowerUser(models.Model):
+    """
+    A tagged model which uses the TagNameLowerModel
+    """
+
+    name = models.CharField(blank=True, max_length=100)
+    singletag = tagulous.models.SingleTagField(
+        TagNameLowerModel, blank=True, null=True, related_name="singletag_users"
+    )
+    tags = tagulous.models.TagField(
+        TagNameLowerModel, blank=True, related_name="tags_users"
+    )
+
+
 class TagMetaUser(models.Model):
     """
     A tagged model which uses the TagMetaModel
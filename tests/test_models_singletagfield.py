@@ -179,6 +179,25 @@ class ModelSingleTagFieldTest(TagTestManager, TestCase):
         t1.title = "Mr"
         self.assertFalse(t1._title_tagulous.changed, "tag has changed")
 
+    def test_lookup_reused_until_saved(self):
+        "Check an existing tag is only looked up once before saving"
+        self.tag_model.objects.create(name="Mr")
+        t1 = self.test_model(name="Test 1", title="Mr")
+        with self.assertNumQueries(1):
+            self.assertEqual(t1.title, "Mr")
+            self.assertEqual(t1.title, "Mr")
+        t1.save()
+        self.assertTagModel(self.tag_model, {"Mr": 1})
+
+    def test_lookup_deleted_before_save(self):
+        "Check a tag found before saving is found again when saved"
+        self.tag_model.objects.create(name="Mr")
+        t1 = self.test_model(name="Test 1", title="Mr")
+        self.assertIsNotNone(t1.title.pk)
+        self.tag_model.objects.all().delete()
+        t1.save()
+        self.assertTagModel(self.tag_model, {"Mr": 1})
+
     def test_change_decreases_count(self):
         "Check a tag string changes the count"
         t1 = self.test_model.objects.create(name="Test 1", title="Mr")
@@ -361,6 +361,16 @@ class ModelTagFieldTest(TagTestManager, TestCase):
         self.assertEqual(t1.tags, "red, blue")
         self.assertEqual(t1.tags, ["red", "blue"])
 
+        # Duplicates collapse, as they would when set
+        self.assertEqual(t1.tags, ["red", "blue", "red"])
+
+        # Empty strings only match no tags
+        self.assertNotEqual(t1.tags, "")
+        self.assertNotEqual(t1.tags, "  ")
+        t3 = self.create(self.test_model, name="3")
+        self.assertEqual(t3.tags, "")
+        self.assertEqual(t3.tags, "  ")
+
         # Test queryset
         tags = t1.tags.tag_model.objects.all()
         self.assertEqual(t1.tags, tags)
@@ -369,6 +379,36 @@ class ModelTagFieldTest(TagTestManager, TestCase):
         t2 = self.create(self.test_model, name="2", tags="blue, red")
         self.assertEqual(t1.tags, t2.tags)
 
+    def test_get_tag_string_cached(self):
+        "Check the cached tag string follows changes to the tags"
+        t1 = self.create(self.test_model, name="1", tags="blue, red")
+        self.assertEqual(t1.tags.get_tag_string(), "blue, red")
+        self.assertEqual(t1.tags.get_tag_string(), "blue, red")
+
+        # Rename a tag in place
+        t1.tags.tags[0].name = "navy"
+        self.assertEqual(t1.tags.get_tag_string(), "navy, red")
+
+        # Replace a tag in place
+        t1.tags.tags[1] = self.tag_model.objects.create(name="pink")
+        self.assertEqual(t1.tags.get_tag_string(), "navy, pink")
+
+        # Reorder in place
+        t1.tags.tags.sort(key=lambda tag: tag.name, reverse=True)
+        self.assertEqual(t1.tags.get_tag_string(), "navy, pink")
+
+        t1.tags.reload()
+        self.assertEqual(t1.tags.get_tag_string(), "blue, red")
+
+        t1.tags.add("green")
+        self.assertEqual(t1.tags.get_tag_string(), "blue, green, red")
+
+        t1.tags = "yellow"
+        self.assertEqual(t1.tags.get_tag_string(), "yellow")
+
+        t1.tags.reload()
+        self.assertEqual(t1.tags.get_tag_string(), "blue, green, red")
+
     def test_ne(self):
         "Check __ne__ correctly determines falsity"
         t1 = self.create(self.test_model, name="1", tags="blue, red")
@@ -452,6 +492,15 @@ class ModelTagFieldTest(TagTestManager, TestCase):
         self.assertInstanceEqual(t1, name="Test 1", tags="blue, green")
         self.assertTagModel(self.tag_model, {"blue": 1, "green": 1})
 
+    def test_m2m_add_by_string_already_set(self):
+        "Add a tag directly using M2M .add(str) when the tag is already set"
+        t1 = self.create(self.test_model, name="Test 1", tags="blue")
+        self.assertTagModel(self.tag_model, {"blue": 1})
+        t1.tags.add("blue", "green")
+        self.assertEqual(t1.tags, "blue, green")
+        self.assertInstanceEqual(t1, name="Test 1", tags="blue, green")
+        self.assertTagModel(self.tag_model, {"blue": 1, "green": 1})
+
     def test_change_string_remove(self):
         "Remove a tag by changing tag string"
         t1 = self.create(self.test_model, name="Test 1", tags="blue, green")
@@ -593,6 +642,44 @@ class ModelTagFieldTest(TagTestManager, TestCase):
         with self.assertNumQueries(2):
             [obj.tags for obj in self.test_model.objects.all().prefetch_related("tags")]
 
+    def test_set_tag_list_single_lookup(self):
+        "Check existing tags are found with a single query"
+        t1 = self.create(self.test_model, name="Test 1", tags="blue, red")
+        self.create(self.test_model, name="Test 2", tags="green, yellow")
+        t1.tags.reload()
+        with self.assertNumQueries(1):
+            t1.tags = "blue, green, purple, yellow"
+        self.assertTrue(t1.tags.changed)
+        self.assertEqual(
+            [tag.pk is not None for tag in t1.tags.tags], [True, True, False, True]
+        )
+
+    def test_save_reloads_once(self):
+        "Check save only loads the current tags once"
+        t1 = self.create(self.test_model, name="Test 1", tags="blue, red")
+        self.create(self.test_model, name="Test 2", tags="green, red")
+        t1.tags = "blue, green"
+        with self.assertNumQueries(9):
+            t1.tags.save()
+        self.assertInstanceEqual(t1, name="Test 1", tags="blue, green")
+        self.assertTagModel(self.tag_model, {"blue": 1, "green": 2, "red": 1})
+
+    def test_get_tags_by_name_non_ascii(self):
+        "Check existing tags with non-ASCII names are found"
+        t1 = self.create(self.test_model, name="Test 1", tags="\u00c9clair")
+        tag = self.tag_model.objects.get(name="\u00c9clair")
+        self.assertEqual(
+            t1.tags._get_tags_by_name(["\u00c9clair"]), {"\u00e9clair": tag}
+        )
+
+    def test_ensure_tags_in_db_single_lookup(self):
+        "Check unsaved tags which exist are found with a single query"
+        t1 = self.create(self.test_model, name="Test 1", tags="blue, red")
+        tags = [self.tag_model(name="blue"), self.tag_model(name="red")]
+        with self.assertNumQueries(1):
+            db_tags = t1.tags._ensure_tags_in_db(tags)
+        self.assertEqual(db_tags, list(self.tag_model.objects.order_by("name")))
+
 
 # ##############################################################################
 # ######  Test it works with concrete inheritance
@@ -1139,6 +1226,34 @@ class ModelTagFieldOptionsTest(TagTestManager, TransactionTestCase):
         self.assertNotEqual(t1.case_sensitive_true, "django, HTML")
         self.assertNotEqual(t1.case_sensitive_true, "Django, html")
 
+    @skip_if_mysql
+    def test_cmp_case_sensitive_true_tags(self):
+        "Test case sensitive matches against managers, querysets and tags"
+        t1 = self.create(
+            self.test_model, name="Test 1", case_sensitive_true="django, html"
+        )
+        t2 = self.create(
+            self.test_model, name="Test 2", case_sensitive_true="django, html"
+        )
+        tag_model = self.test_model.case_sensitive_true.tag_model
+
+        # Another manager
+        self.assertEqual(t1.case_sensitive_true, t2.case_sensitive_true)
+
+        # Queryset and list of tags
+        tags = tag_model.objects.filter(name__in=["django", "html"])
+        self.assertEqual(t1.case_sensitive_true, tags)
+        self.assertEqual(t1.case_sensitive_true, list(tags))
+        self.assertNotEqual(
+            t1.case_sensitive_true, tag_model.objects.filter(name="django")
+        )
+
+        # Manager holding unsaved tags
+        t3 = self.test_model(name="Test 3", case_sensitive_true="django, html")
+        self.assertEqual(t1.case_sensitive_true, t3.case_sensitive_true)
+        t3.case_sensitive_true = "django, HTML"
+        self.assertNotEqual(t1.case_sensitive_true, t3.case_sensitive_true)
+
     @skip_if_mysql
     def test_contains_case_sensitive_true(self):
         "Check case sensitive __contains__"
@@ -1169,6 +1284,19 @@ class ModelTagFieldOptionsTest(TagTestManager, TransactionTestCase):
         self.assertEqual(t1.case_sensitive_false, "adam, BRIAN")
         self.assertNotEqual(t1.case_sensitive_false, "Chris")
 
+    def test_case_sensitive_false_lookup_batched(self):
+        "Check a large number of names can be looked up case insensitively"
+        t1 = self.create(
+            self.test_model, name="Test 1", case_sensitive_false="t1, t700, t1400"
+        )
+        t1.case_sensitive_false.set_tag_list(["T%d" % i for i in range(1500)])
+        tags = t1.case_sensitive_false.tags
+        self.assertEqual(len(tags), 1500)
+        self.assertEqual(
+            sorted(tag.name for tag in tags if tag.pk is not None),
+            ["t1", "t1400", "t700"],
+        )
+
     def test_force_lowercase_true(self):
         self.create(self.test_model, name="Test 1", force_lowercase_true="Adam")
         self.assertTagModel(self.test_model.force_lowercase_true, {"adam": 1})
@@ -19,6 +19,7 @@ from django.utils import six
 
 import tagulous.settings as tagulous_settings
 from tagulous import models as tag_models
+from tagulous.models import managers as tag_managers
 from tagulous import utils as tag_utils
 from tagulous.settings import SLUG_TRUNCATE_UNIQUE
 from tests.lib import TagTestManager
@@ -469,6 +470,56 @@ class TagModelTest(TagTestManager, TestCase):
         self.assertEqual(t2a.slug, slug2)
 
 
+# ##############################################################################
+# ###### Test optional name_lower field on tag model
+# ##############################################################################
+
+
+class TagModelNameLowerTest(TagTestManager, TestCase):
+    """
+    Test tag models with a name_lower field
+    """
+
+    manage_models = [test_models.TagNameLowerUser]
+
+    def setUpExtra(self):
+        self.tag_model = test_models.TagNameLowerModel
+        self.test_model = test_models.TagNameLowerUser
+
+    def test_has_name_lower(self):
+        "Check the name_lower flag is set on the tag model class"
+        self.assertTrue(self.tag_model._has_name_lower)
+        self.assertFalse(test_models.MixedTestTagModel._has_name_lower)
+
+    def test_save_sets_name_lower(self):
+        "Check name_lower is maintained when the tag is saved"
+        t1 = self.tag_model.objects.create(name="Adam")
+        self.assertEqual(t1.name_lower, "adam")
+        t1.name = "Brian"
+        t1.save()
+        self.assertEqual(self.tag_model.objects.get(pk=t1.pk).name_lower, "brian")
+
+    def test_singletag_lookup(self):
+        "Check SingleTagField finds an existing tag using name_lower"
+        tag = self.tag_model.objects.create(name="Adam")
+        t1 = self.test_model(name="Test 1", singletag="ADAM")
+        manager = t1._singletag_tagulous
+        self.assertEqual(
+            tag_managers._name_lookup(manager.tag_model, manager.tag_options, "ADAM"),
+            {"name_lower": "adam"},
+        )
+        self.assertEqual(t1.singletag, tag)
+        t1.save()
+        self.assertTagModel(self.tag_model, {"Adam": 1})
+
+    def test_tagfield_lookup(self):
+        "Check TagField finds existing tags using name_lower"
+        self.tag_model.objects.create(name="Adam")
+        t1 = self.create(self.test_model, name="Test 1", tags="ADAM, brian")
+        self.assertEqual(t1.tags, "Adam, brian")
+        self.assertTagModel(self.tag_model, {"Adam": 1, "brian": 1})
+
+
 # ##############################################################################
 # ###### Test TagMeta in tag model
 # ##############################################################################
@@ -67,6 +67,44 @@ class TagOptionsTest(TestCase):
         self.assertEqual(opt.initial, ["one", "two"])
         self.assertEqual(opt.force_lowercase, False)
 
+    def test_initial_tuple(self):
+        opt = tag_models.TagOptions(initial=("one", "two"))
+        self.assertEqual(opt.initial_string, "one, two")
+        self.assertEqual(opt.initial, ["one", "two"])
+
+    def test_initial_deferred(self):
+        opt = tag_models.TagOptions(initial="two, one")
+        self.assertEqual(opt.initial_string, "two, one")
+
+        # Combining options passes the tag string on as it was given
+        self.assertEqual((opt + tag_models.TagOptions()).initial_string, "two, one")
+        opt2 = tag_models.TagOptions().set_missing(opt)
+        self.assertEqual(opt2.initial_string, "two, one")
+
+        # Reading initial parses it
+        self.assertEqual(opt.initial, ["one", "two"])
+        self.assertEqual(opt.items(with_defaults=False), {"initial": ["one", "two"]})
+
+        opt.initial = ["three", "four"]
+        self.assertEqual(opt.initial_string, "four, three")
+        self.assertEqual(opt.items(with_defaults=False), {"initial": ["three", "four"]})
+
+    def test_items_cache_cleared(self):
+        opt = tag_models.TagOptions(force_lowercase=True)
+        items = opt.items(with_defaults=False)
+        self.assertEqual(items, {"force_lowercase": True})
+
+        # Returned dict can be changed without affecting the options
+        items["max_count"] = 5
+        self.assertEqual(opt.items(with_defaults=False), {"force_lowercase": True})
+
+        # Setting an option is reflected in the items
+        opt.max_count = 10
+        self.assertEqual(
+            opt.items(with_defaults=False), {"force_lowercase": True, "max_count": 10}
+        )
+        self.assertEqual(opt.items()["max_count"], 10)
+
     def test_set_invalid(self):
         with self.assertRaises(AttributeError) as cm:
             tag_models.TagOptions(invalid=False)
@@ -76,7 +114,10 @@ class TagOptionsTest(TestCase):
         opt = tag_models.TagOptions()
         with self.assertRaises(AttributeError) as cm:
             opt.invalid
-        self.assertEqual(six.text_type(cm.exception), "invalid")
+        self.assertEqual(
+            six.text_type(cm.exception),
+            "'TagOptions' object has no attribute 'invalid'",
+        )
 
     def test_update_dict(self):
         opt = tag_models.TagOptions(initial="Adam, Brian")